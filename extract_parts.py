@@ -1,19 +1,68 @@
 import argparse
+import io
+import math
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 
 
-def extract_first_value(text: str, label: str) -> str | None:
-    match = re.search(rf"(?i)\b{re.escape(label)}\s*:\s*([^\r\n]+)", text)
+def _label_re(label: str) -> re.Pattern[str]:
+    return re.compile(rf"(?i)\b{re.escape(label)}\s*:\s*([^\r\n]+)")
+
+
+_PART_RE = _label_re("Part")
+_ASM_RE = _label_re("Asm")
+_JOB_RE = _label_re("Job")
+_LABEL_RE = {"Part": _PART_RE, "Asm": _ASM_RE, "Job": _JOB_RE}
+
+# All three labels in one pass. The value sits in a lookahead so a label that
+# shares a line with another (e.g. "Part: X  Asm: Y") is still matched.
+_FIELDS_RE = re.compile(r"(?i)\b(Part|Asm|Job)\s*:(?=\s*([^\r\n]+))")
+# Bytes twin of _FIELDS_RE for ASCII-only text, which is most pages and runs
+# about twice as fast. str \s also matches \x1c-\x1f, so spell that out.
+_FIELDS_BYTES_RE = re.compile(
+    rb"(?i)\b(Part|Asm|Job)[\s\x1c-\x1f]*:(?=[\s\x1c-\x1f]*([^\r\n]+))"
+)
+
+# Raw content stream peek: a small tokenizer plus "(Part: X)" string operands.
+_CONTENT_TOKEN_RE = re.compile(
+    rb"\s+|%[^\r\n]*|\((?:[^()\\]|\\.)*\)|<<|>>|<[0-9A-Fa-f\s]*>|[\[\]{}]"
+    rb"|/[^\s()<>\[\]{}/%]*|[^\s()<>\[\]{}/%]+",
+    re.S,
+)
+_CONTENT_NUMBER_RE = re.compile(rb"[+-]?(?:\d+\.?\d*|\.\d+)")
+# Values are limited to printable ASCII minus ' and `, which decode the same
+# under every standard simple-font encoding.
+_CONTENT_FIELDS_RE = re.compile(rb"(?i)\((Part|Asm|Job) *: *([^\x00-\x1f'()\\`\x7f-\xff]*)\)")
+_CONTENT_ANY_LABEL_RE = re.compile(rb"(?i)\b(?:Part|Asm|Job)\s*:")
+_STANDARD_ENCODINGS = ("/WinAnsiEncoding", "/StandardEncoding", "/MacRomanEncoding")
+_CONTENT_PEEK_BYTES = 16384
+
+# How much extracted text to watch for the header fields before giving up
+# on stopping early.
+_HEADER_CHARS = 4096
+
+
+def _first_value(match: re.Match[str] | None) -> str | None:
     if not match:
         return None
     value = match.group(1).strip()
     return value or None
 
 
+def extract_first_value(text: str, label: str) -> str | None:
+    pattern = _LABEL_RE.get(label) or _label_re(label)
+    return _first_value(pattern.search(text))
+
+
 def extract_first_part(text: str) -> str | None:
     # First "Part:" on the page wins.
-    value = extract_first_value(text, "Part")
+    return _first_part_segment(_first_value(_PART_RE.search(text)))
+
+
+def _first_part_segment(value: str | None) -> str | None:
     if not value:
         return None
 
@@ -25,18 +74,386 @@ def extract_first_part(text: str) -> str | None:
 
 
 def extract_first_asm(text: str) -> str | None:
-    return extract_first_value(text, "Asm")
+    return _first_value(_ASM_RE.search(text))
 
 
 def extract_first_job(text: str) -> str | None:
-    return extract_first_value(text, "Job")
+    return _first_value(_JOB_RE.search(text))
+
+
+def extract_fields(text: str) -> tuple[str | None, str | None, str | None]:
+    # Same results as the extract_first_* helpers, but one scan of the page.
+    found: dict[str, str] = {}
+    if text.isascii():
+        for match in _FIELDS_BYTES_RE.finditer(text.encode("ascii")):
+            found.setdefault(
+                match.group(1).decode("latin-1").lower(),
+                match.group(2).decode("latin-1").strip(),
+            )
+            if len(found) == 3:
+                break
+    else:
+        for match in _FIELDS_RE.finditer(text):
+            found.setdefault(match.group(1).lower(), match.group(2).strip())
+            if len(found) == 3:
+                break
+    part = _first_part_segment(found.get("part"))
+    return part, found.get("asm") or None, found.get("job") or None
 
 
 def iter_pdfs(folder: Path, recursive: bool):
+    # scandir/walk reuse the directory entry type, so no stat per file.
     if recursive:
-        yield from folder.rglob("*.pdf")
+        for dirpath, _dirnames, filenames in os.walk(folder):
+            for name in filenames:
+                if name.lower().endswith(".pdf"):
+                    yield Path(dirpath, name)
     else:
-        yield from folder.glob("*.pdf")
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith(".pdf") and entry.is_file():
+                    yield Path(entry.path)
+
+
+class _EarlyStop(BaseException):
+    # Not an Exception: pypdf wraps some visitor calls in "except Exception".
+    pass
+
+
+def _fields_complete(text: str) -> bool:
+    # True once Part, Asm and Job each have a value followed by a line break,
+    # i.e. more text can no longer change what extract_fields() returns.
+    seen: set[str] = set()
+    for match in _FIELDS_RE.finditer(text):
+        label = match.group(1).lower()
+        if label in seen:
+            continue
+        if match.end(2) == len(text):
+            return False
+        seen.add(label)
+        if len(seen) == 3:
+            return True
+    return False
+
+
+def _extract_header_text(page) -> str:
+    # Stop pypdf's content stream walk as soon as the header fields are known.
+    # Only the first _HEADER_CHARS are checked, so a page that lacks a label
+    # costs one full extraction rather than a rescan per line. pypdf reports
+    # form XObject text to the visitor twice, so after a Do the chunks are no
+    # longer a prefix of the real text and the page is extracted in full.
+    chunks: list[str] = []
+    size = 0
+    watching = True
+
+    def visitor_operand(op, operands, cm, tm):
+        nonlocal watching
+        if op == b"Do":
+            watching = False
+
+    def visitor(text, cm, tm, font_dict, font_size):
+        nonlocal size
+        if not watching or size > _HEADER_CHARS:
+            return
+        chunks.append(text)
+        size += len(text)
+        if "\n" in text and _fields_complete("".join(chunks)):
+            raise _EarlyStop
+
+    try:
+        text = page.extract_text(
+            extraction_mode="plain",
+            visitor_operand_before=visitor_operand,
+            visitor_text=visitor,
+        )
+    except _EarlyStop:
+        return "".join(chunks)
+    return text or ""
+
+
+def _content_ops(data: bytes):
+    # Yields (operator, operands, end offset). Stops at the first thing the
+    # tokenizer cannot follow, e.g. a string cut off by the peek limit.
+    operands: list = []
+    array: list | None = None
+    pos = 0
+    while pos < len(data):
+        match = _CONTENT_TOKEN_RE.match(data, pos)
+        if match is None:
+            return
+        pos = match.end()
+        token = match.group()
+        if token[:1].isspace() or token[:1] == b"%":
+            continue
+        if token == b"[":
+            if array is not None:
+                return
+            array = []
+        elif token == b"]":
+            if array is None:
+                return
+            operands.append(array)
+            array = None
+        elif array is not None:
+            array.append(token)
+        elif (
+            token[:1] in (b"(", b"<", b"/", b"{", b"}")
+            or token in (b"true", b"false", b"null")
+            or _CONTENT_NUMBER_RE.fullmatch(token)
+        ):
+            operands.append(token)
+        else:
+            yield token, operands, pos
+            operands = []
+
+
+def _peek_content_fields(
+    data: bytes, complete: bool = True
+) -> tuple[str | None, str | None, str | None] | None:
+    # Find Part/Asm/Job without running pypdf's text extraction. Until all
+    # three are known, every string shown must be a "(Label: value)" literal
+    # shown with Tj, ' or " as the first text on its line, with a line break
+    # (as pypdf decides it) before any further text. Anything else -- other
+    # text, TJ arrays, hex or split strings, unsupported operators -- returns
+    # None so the caller falls back to full extraction. `complete` says
+    # whether `data` is the whole stream, i.e. whether its end also ends the
+    # last line. Font encodings are checked by the caller.
+    found: dict[bytes, bytes] = {}
+    accepted = 0
+    pending: tuple[bytes, bytes] | None = None
+    line_start = True
+    has_output = False
+    font_size = 12.0
+    leading = 0.0
+    scale_a = scale_d = 1.0
+    y = prev_y = 0.0
+    saved: list[tuple[float, float]] = []
+    lost = False
+    stop = 0
+
+    for op, operands, stop in _content_ops(data):
+        try:
+            if op == b"BT":
+                scale_a = scale_d = 1.0
+                y = 0.0
+                continue
+            elif op == b"Tf":
+                font_size = float(operands[1])
+                continue
+            elif op == b"TL":
+                leading = float(operands[0])
+                continue
+            elif op in (b"Td", b"TD"):
+                ty = float(operands[1])
+                if op == b"TD":
+                    leading = -ty
+                y += ty * scale_d
+            elif op == b"Tm":
+                a, b, c, d, _e, f = (float(v) for v in operands)
+                if b or c or a <= 0 or d <= 0:
+                    break
+                scale_a, scale_d, y = a, d, f
+            elif op in (b"T*", b"'", b'"'):
+                y -= leading
+            elif op in (b"Tj", b"TJ"):
+                pass
+            elif op in (b"cm", b"q", b"Q"):
+                # Only a uniform, unrotated CTM set up before any text keeps
+                # line-break decisions the same as in text space. Later
+                # changes are fine as long as no more text follows.
+                if has_output:
+                    lost = True
+                if op == b"cm":
+                    a, b, c, d, _e, _f = (float(v) for v in operands)
+                    if b or c or a <= 0 or a != d:
+                        lost = True
+                elif op == b"q":
+                    saved.append((font_size, leading))
+                elif saved:
+                    font_size, leading = saved.pop()
+                else:
+                    break
+                continue
+            elif op in (b"Do", b"BI", b"ID", b"EI"):
+                break
+            else:
+                continue
+        except (ValueError, IndexError):
+            break
+
+        if lost:
+            break
+        # pypdf's line-break test, run on every positioning/show operator.
+        dy = y - prev_y
+        prev_y = y
+        if has_output and dy < -0.8 * font_size * math.sqrt(scale_a * scale_d):
+            if pending is not None:
+                found.setdefault(*pending)
+                accepted += 1
+                pending = None
+            line_start = True
+        if op in (b"Td", b"TD", b"Tm", b"T*"):
+            continue
+
+        if pending is not None:
+            return None
+        if len(found) == 3:
+            break
+        string = operands[-1] if operands else None
+        if op == b"TJ" or not line_start or not isinstance(string, bytes):
+            return None
+        match = _CONTENT_FIELDS_RE.fullmatch(string)
+        if match is None:
+            return None
+        pending = (match.group(1).lower(), match.group(2))
+        line_start = False
+        has_output = True
+    else:
+        if pending is not None and complete and not data[stop:].strip():
+            found.setdefault(*pending)
+            accepted += 1
+            pending = None
+
+    if len(found) < 3:
+        return None
+    # Every label occurrence up to where we stopped must be one we accepted,
+    # otherwise pypdf may see an earlier or different value.
+    if len(_CONTENT_ANY_LABEL_RE.findall(data[:stop].replace(b"\\", b""))) != accepted:
+        return None
+    part, asm, job = (found[k].decode("latin-1").strip() for k in (b"part", b"asm", b"job"))
+    if not (part and asm and job):
+        return None
+    return _first_part_segment(part), asm, job
+
+
+def _simple_fonts(page) -> bool:
+    # True when every page font decodes printable ASCII as itself in pypdf:
+    # Type1/TrueType, no ToUnicode map, no symbol font, standard encoding.
+    try:
+        fonts = page["/Resources"]["/Font"]
+    except KeyError:
+        return False
+    for ref in fonts.values():
+        font = ref.get_object()
+        if font.get("/Subtype") not in ("/Type1", "/TrueType"):
+            return False
+        if "/ToUnicode" in font:
+            return False
+        base_font = str(font.get("/BaseFont", ""))
+        if "Symbol" in base_font or "Dingbats" in base_font:
+            return False
+        encoding = font.get("/Encoding")
+        if encoding is not None and encoding.get_object() not in _STANDARD_ENCODINGS:
+            return False
+    return True
+
+
+def _peek_fields(page) -> tuple[str | None, str | None, str | None] | None:
+    if not _simple_fonts(page):
+        return None
+    contents = page.get_contents()
+    if contents is None:
+        return None
+    data = contents.get_data()
+    return _peek_content_fields(
+        data[:_CONTENT_PEEK_BYTES], complete=len(data) <= _CONTENT_PEEK_BYTES
+    )
+
+
+def _slurp(pdf_path: str) -> io.BytesIO:
+    # One pre-sized read instead of letting pypdf seek around the file.
+    size = os.stat(pdf_path).st_size
+    buf = bytearray(size)
+    view = memoryview(buf)
+    offset = 0
+    with open(pdf_path, "rb", buffering=0) as f:
+        while offset < size:
+            n = f.readinto(view[offset:])
+            if not n:
+                break
+            offset += n
+    return io.BytesIO(view[:offset])
+
+
+def iter_page_fields(pdf_path: str):
+    # PyMuPDF is much faster at plain text extraction; pypdf is the fallback.
+    try:
+        import pymupdf
+    except ImportError:
+        pymupdf = None
+
+    if pymupdf is not None:
+        with pymupdf.open(pdf_path) as doc:
+            for idx in range(doc.page_count):
+                yield extract_fields(doc.load_page(idx).get_text("text"))
+        return
+
+    from pypdf import PdfReader
+
+    # Lenient parsing; one reader is shared by all pages of the file so
+    # resolved objects (fonts included) are only read once.
+    reader = PdfReader(_slurp(pdf_path), strict=False)
+    for page in reader.pages:
+        fields = _peek_fields(page)
+        if fields is None:
+            fields = extract_fields(_extract_header_text(page))
+        yield fields
+
+
+def page_runs(pages: list[tuple[int, str, str]]) -> list[tuple[int, int, str, str]]:
+    # Collapse consecutive pages with the same (part, asm) into
+    # (start, end, part, asm) runs. Pages without a Part: value do not break
+    # a run.
+    runs: list[tuple[int, int, str, str]] = []
+    if not pages:
+        return runs
+
+    range_start, last_part, last_asm = pages[0]
+    range_end = range_start
+    for idx, part, asm in islice(pages, 1, None):
+        if part == last_part and asm == last_asm:
+            range_end = idx
+            continue
+        runs.append((range_start, range_end, last_part, last_asm))
+        range_start = range_end = idx
+        last_part = part
+        last_asm = asm
+
+    runs.append((range_start, range_end, last_part, last_asm))
+    return runs
+
+
+def format_runs(runs: list[tuple[int, int, str, str]]) -> list[str]:
+    return [
+        f"Page {start}{'' if start == end else f'-{end}'}  Asm: {asm}  Part: {part}"
+        for start, end, part, asm in runs
+    ]
+
+
+def process_pdf(pdf_path: str) -> tuple[str | None, list[tuple[int, int, str, str]]]:
+    job_value: str | None = None
+    pages: list[tuple[int, str, str]] = []
+    for idx, (part, asm, job) in enumerate(iter_page_fields(pdf_path), start=1):
+        if job_value is None:
+            job_value = job
+        if part:
+            pages.append((idx, part, asm or ""))
+
+    return job_value, page_runs(pages)
+
+
+def iter_pdf_results(pdf_paths: list[str]):
+    if len(pdf_paths) == 1:
+        yield process_pdf(pdf_paths[0])
+        return
+
+    # Each PDF is parsed independently, so spread them across processes.
+    # map() still yields results in input order.
+    workers = min(len(pdf_paths), os.cpu_count() or 1)
+    # Small batches get one PDF per task so every worker has something to do.
+    chunksize = max(1, len(pdf_paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(process_pdf, pdf_paths, chunksize=chunksize)
 
 
 def main() -> int:
@@ -62,11 +479,14 @@ def main() -> int:
     args = parser.parse_args()
 
     try:
-        from pypdf import PdfReader
+        import pymupdf  # noqa: F401
     except Exception:
-        print("Missing dependency: pypdf")
-        print("Install with: python -m pip install -r requirements.txt")
-        return 2
+        try:
+            import pypdf  # noqa: F401
+        except Exception:
+            print("Missing dependency: PyMuPDF (or pypdf)")
+            print("Install with: python -m pip install -r requirements.txt")
+            return 2
 
     input_path = Path(args.input)
     if input_path.is_file():
@@ -83,66 +503,47 @@ def main() -> int:
         print("No PDFs found.")
         return 0
 
-    rows: list[str] = []
-    for pdf in pdfs:
-        reader = PdfReader(str(pdf))
-        file_rows: list[str] = []
-        job_value: str | None = None
-        last_part: str | None = None
-        last_asm: str | None = None
-        range_start: int | None = None
-        range_end: int | None = None
-
-        def flush_range():
-            if last_part is None or range_start is None or range_end is None:
-                return
-            if range_start == range_end:
-                page_label = f"Page {range_start}"
-            else:
-                page_label = f"Page {range_start}-{range_end}"
-            file_rows.append(f"{page_label}  Asm: {last_asm or ''}  Part: {last_part}")
-
-        for idx, page in enumerate(reader.pages, start=1):
-            text = page.extract_text() or ""
-            if job_value is None:
-                job_value = extract_first_job(text) or None
-            part = extract_first_part(text)
-            if not part:
-                continue
-            asm = extract_first_asm(text) or ""
-            if last_part is None:
-                last_part = part
-                last_asm = asm
-                range_start = idx
-                range_end = idx
-                continue
-
-            if part == last_part and asm == last_asm and range_end is not None:
-                range_end = idx
+    pdf_paths = [os.fspath(pdf) for pdf in pdfs]
+    # Rows are encoded once and written as bytes; os.linesep keeps the
+    # platform line endings the text-mode writer used to produce.
+    eol = os.linesep.encode()
+    # Written to a temp file next to the output and swapped in only once every
+    # PDF has been processed, so a failed run leaves the old parts.txt alone.
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    out = None
+    line_count = 0
+    try:
+        for pdf, (job_value, runs) in zip(pdfs, iter_pdf_results(pdf_paths)):
+            if not runs:
                 continue
-
-            flush_range()
-            last_part = part
-            last_asm = asm
-            range_start = idx
-            range_end = idx
-
-        flush_range()
-
-        if file_rows:
+            block = bytearray()
+            if out is None:
+                # Opened lazily so no file is written when nothing matches.
+                out = open(tmp_path, "wb", buffering=1 << 20)
+            else:
+                block += eol
+                line_count += 1
             if job_value:
-                rows.append(f"Job: {job_value}")
-            rows.append(f"File: {pdf.name}")
-            rows.extend(file_rows)
-            rows.append("")
+                block += f"Job: {job_value}".encode("utf-8") + eol
+                line_count += 1
+            block += f"File: {pdf.name}".encode("utf-8") + eol
+            for row in format_runs(runs):
+                block += row.encode("utf-8") + eol
+            line_count += len(runs) + 1
+            out.write(block)
+    except BaseException:
+        if out is not None:
+            out.close()
+            os.remove(tmp_path)
+        raise
 
-    if not rows:
+    if out is None:
         print("No Part: values found.")
         return 0
 
-    output_text = "\n".join(rows).rstrip() + "\n"
-    output_path.write_text(output_text, encoding="utf-8")
-    print(f"Wrote {len(rows)} line(s) to: {output_path}")
+    out.close()
+    os.replace(tmp_path, output_path)
+    print(f"Wrote {line_count} line(s) to: {output_path}")
     return 0
 
 
@@ -1,44 +1,94 @@
 import argparse
-import re
+import errno
+import functools
+import os
 import shutil
 from pathlib import Path
 
+# Characters Windows does not allow in file or folder names.
+_UNSAFE_CHARS = str.maketrans({c: "_" for c in '<>:"/\\|?*'})
+
+_JOB_PREFIXES = ("Job:", "job:", "JOB:")
+
 
 def iter_pdfs(folder: Path, recursive: bool):
+    # scandir/walk reuse the directory entry type, so no stat per file.
     if recursive:
-        yield from folder.rglob("*.pdf")
+        for dirpath, _dirnames, filenames in os.walk(folder):
+            for name in filenames:
+                if name.lower().endswith(".pdf"):
+                    yield Path(dirpath, name)
     else:
-        yield from folder.glob("*.pdf")
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith(".pdf") and entry.is_file():
+                    yield Path(entry.path)
 
 
+@functools.lru_cache(maxsize=64)
 def safe_folder_name(name: str) -> str:
     # Keep it Windows-safe.
-    return re.sub(r"[<>:\"/\\\\|?*]", "_", name).strip().rstrip(".")
+    return name.translate(_UNSAFE_CHARS).strip().rstrip(".")
+
+
+def list_names(folder: Path) -> set[str]:
+    # normcase so collisions are checked case-insensitively on Windows.
+    with os.scandir(folder) as entries:
+        return {os.path.normcase(entry.name) for entry in entries}
+
 
+def _is_cross_device(e: OSError) -> bool:
+    # WinError 17: ERROR_NOT_SAME_DEVICE.
+    return e.errno == errno.EXDEV or getattr(e, "winerror", None) == 17
 
-def move_pdf(pdf: Path, dest_folder: Path):
+
+def move_pdf(pdf: Path, dest_folder: Path, existing: set[str] | None = None):
+    # Pass the same `existing` set (from list_names) across calls to avoid
+    # re-listing dest_folder for every move.
     dest_folder.mkdir(parents=True, exist_ok=True)
-    dest_path = dest_folder / pdf.name
-    if dest_path.exists():
-        stem = pdf.stem
-        suffix = pdf.suffix
-        i = 1
-        while True:
-            candidate = dest_folder / f"{stem} ({i}){suffix}"
-            if not candidate.exists():
-                dest_path = candidate
-                break
-            i += 1
-    shutil.move(str(pdf), str(dest_path))
-    return dest_path
+    if existing is None:
+        existing = list_names(dest_folder)
+    stem = pdf.stem
+    suffix = pdf.suffix
+    name = pdf.name
+    i = 0
+    while True:
+        if i:
+            name = f"{stem} ({i}){suffix}"
+        i += 1
+        key = os.path.normcase(name)
+        if key in existing:
+            continue
+        dest_path = dest_folder / name
+        # The listing may be stale or miss case-insensitive matches (macOS),
+        # and os.rename only refuses to overwrite on Windows, so check again.
+        if os.path.lexists(dest_path):
+            existing.add(key)
+            continue
+        try:
+            os.rename(pdf, dest_path)
+        except FileExistsError:
+            existing.add(key)
+            continue
+        except OSError as e:
+            if not _is_cross_device(e):
+                raise
+            shutil.move(os.fspath(pdf), os.fspath(dest_path))
+        existing.add(key)
+        return dest_path
 
 
 def get_job_from_parts_txt(parts_txt: Path) -> str | None:
     if not parts_txt.is_file():
         return None
-    for line in parts_txt.read_text(encoding="utf-8", errors="ignore").splitlines():
-        if line.strip().lower().startswith("job:"):
-            return line.split(":", 1)[1].strip() or None
+    # Read line by line: the Job: line is normally the first one, so this
+    # usually stops after a single read instead of loading the whole file.
+    with open(parts_txt, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            # extract_parts.py writes "Job:"; the lowercase check covers
+            # hand-edited files.
+            if line.startswith(_JOB_PREFIXES) or line.lstrip()[:4].lower() == "job:":
+                return line.split(":", 1)[1].strip() or None
     return None
 
 
@@ -67,17 +117,22 @@ def main() -> int:
     dest_folder = history_root / safe_folder_name(f"Job - {job}")
 
     moved = 0
+    existing: set[str] | None = None
     for src in sources:
         if not src.exists():
             continue
-        for pdf in iter_pdfs(src, args.recursive):
-            move_pdf(pdf, dest_folder)
+        # Snapshot the listing before moving entries out of the folder.
+        for pdf in tuple(iter_pdfs(src, args.recursive)):
+            if existing is None:
+                dest_folder.mkdir(parents=True, exist_ok=True)
+                existing = list_names(dest_folder)
+            move_pdf(pdf, dest_folder, existing)
             moved += 1
 
     parts_txt = insert_traveler / "parts.txt"
     if parts_txt.is_file():
         dest_folder.mkdir(parents=True, exist_ok=True)
-        shutil.move(str(parts_txt), str(dest_folder / parts_txt.name))
+        shutil.move(os.fspath(parts_txt), os.fspath(dest_folder / parts_txt.name))
         moved += 1
 
     print(f"Job folder: {dest_folder}")
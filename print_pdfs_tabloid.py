@@ -1,19 +1,16 @@
 ﻿import argparse
+import asyncio
+import functools
 import os
 import shutil
-import subprocess
-import time
 from pathlib import Path
 
 DEFAULT_PRINTER = "Kyocera TASKalfa 3501i"
 DEFAULT_SLEEP_SECONDS = 1.5
+DEFAULT_CONCURRENCY = 1
 
 
-def find_sumatra(explicit_path: str | None) -> str | None:
-    if explicit_path:
-        p = Path(explicit_path)
-        return str(p) if p.is_file() else None
-
+def _default_candidates() -> tuple[str, ...]:
     local_appdata = os.environ.get("LOCALAPPDATA")
     appdata = os.environ.get("APPDATA")
     script_dir = Path(__file__).resolve().parent
@@ -29,8 +26,19 @@ def find_sumatra(explicit_path: str | None) -> str | None:
         str(Path(local_appdata) / "SumatraPDF" / "SumatraPDF.exe") if local_appdata else None,
         str(Path(appdata) / "SumatraPDF" / "SumatraPDF.exe") if appdata else None,
     ]
-    for c in candidates:
-        if c and Path(c).is_file():
+    return tuple(filter(None, candidates))
+
+
+_DEFAULT_CANDIDATES = _default_candidates()
+
+
+@functools.lru_cache(maxsize=4)
+def find_sumatra(explicit_path: str | None) -> str | None:
+    if explicit_path:
+        return explicit_path if os.path.isfile(explicit_path) else None
+
+    for c in _DEFAULT_CANDIDATES:
+        if os.path.isfile(c):
             return c
 
     which = shutil.which("SumatraPDF.exe") or shutil.which("SumatraPDF")
@@ -38,10 +46,43 @@ def find_sumatra(explicit_path: str | None) -> str | None:
 
 
 def iter_pdfs(folder: Path, recursive: bool):
+    # scandir/walk reuse the directory entry type, so no stat per file.
     if recursive:
-        yield from folder.rglob("*.pdf")
+        for dirpath, _dirnames, filenames in os.walk(folder):
+            for name in filenames:
+                if name.lower().endswith(".pdf"):
+                    yield Path(dirpath, name)
     else:
-        yield from folder.glob("*.pdf")
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith(".pdf") and entry.is_file():
+                    yield Path(entry.path)
+
+
+async def print_pdf(sem: asyncio.Semaphore, cmd: tuple[str, ...], pdf: str, sleep: float) -> bool:
+    async with sem:
+        print(f"Printing: {pdf}")
+        try:
+            # Sumatra exits once the job is handed to the spooler.
+            proc = await asyncio.create_subprocess_exec(*cmd)
+            returncode = await proc.wait()
+        except Exception as e:
+            print(f"Failed: {pdf} ({e})")
+            return False
+        finally:
+            if sleep > 0:
+                await asyncio.sleep(sleep)
+
+    if returncode != 0:
+        print(f"Failed: {pdf} (exit {returncode})")
+        return False
+    return True
+
+
+async def print_all(jobs: list[tuple[str, tuple[str, ...]]], concurrency: int, sleep: float) -> int:
+    sem = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(*(print_pdf(sem, cmd, pdf, sleep) for pdf, cmd in jobs))
+    return results.count(False)
 
 
 def main() -> int:
@@ -73,10 +114,18 @@ def main() -> int:
         "--sleep",
         type=float,
         default=DEFAULT_SLEEP_SECONDS,
-        help="Seconds to wait between print jobs (default: 1.5)",
+        help="Seconds to wait after each print job (default: 1.5)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Print jobs to submit at once; above 1, jobs may print out of order (default: {DEFAULT_CONCURRENCY})",
     )
 
     args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
     folder = Path(args.folder)
 
     if not folder.is_dir():
@@ -89,7 +138,8 @@ def main() -> int:
         print("Install SumatraPDF or pass --sumatra with the full path to SumatraPDF.exe.")
         return 3
 
-    pdfs = sorted(iter_pdfs(folder, args.recursive))
+    # Sort as Paths (case-insensitive on Windows), then keep plain strings.
+    pdfs = [os.fspath(p) for p in sorted(iter_pdfs(folder, args.recursive))]
     if not pdfs:
         print("No PDFs found.")
         return 0
@@ -101,28 +151,18 @@ def main() -> int:
     # Sumatra settings: fit to printable area, tabloid paper, one-sided
     print_settings = "fit,paper=tabloid,duplex=off"
 
-    failures = 0
-    for pdf in pdfs:
-        print(f"Printing: {pdf}")
-        cmd = [
-            sumatra,
-            "-print-to",
-            args.printer,
-            "-print-settings",
-            print_settings,
-            "-silent",
-            str(pdf),
-        ]
-        try:
-            completed = subprocess.run(cmd, check=False)
-            if completed.returncode != 0:
-                failures += 1
-                print(f"Failed: {pdf} (exit {completed.returncode})")
-        except Exception as e:
-            failures += 1
-            print(f"Failed: {pdf} ({e})")
+    # Only the file path changes between jobs.
+    cmd_prefix = (
+        sumatra,
+        "-print-to",
+        args.printer,
+        "-print-settings",
+        print_settings,
+        "-silent",
+    )
+    jobs = [(pdf, (*cmd_prefix, pdf)) for pdf in pdfs]
 
-        time.sleep(args.sleep)
+    failures = asyncio.run(print_all(jobs, args.concurrency, args.sleep))
 
     if failures:
         print(f"Done with {failures} failure(s).")
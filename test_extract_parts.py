@@ -0,0 +1,126 @@
+import io
+
+import pytest
+
+from extract_parts import _extract_header_text, _peek_content_fields, _peek_fields, extract_fields
+
+
+def _stream(*lines: bytes) -> bytes:
+    return b"BT /F1 12 Tf 14 TL 72 720 Td " + b" ".join(lines) + b" ET"
+
+
+def test_peek_reads_one_label_per_line():
+    data = _stream(b"(Job: 1234) Tj T*", b"(Part: P-1/P-2) Tj T*", b"(Asm: 0) Tj")
+    assert _peek_content_fields(data) == ("P-1", "0", "1234")
+
+
+def test_peek_rejects_kerned_tj_array():
+    # pypdf reads "Part: 1234" here.
+    data = _stream(b"(Job: 1) Tj T*", b"[(Part: 12)-20(34)] TJ T*", b"(Asm: 0) Tj")
+    assert _peek_content_fields(data) is None
+
+
+def test_peek_rejects_value_split_across_operands():
+    # pypdf reads "Part: ABC-1" here.
+    data = _stream(b"(Job: 1) Tj T*", b"(Part: AB) Tj (C-1) Tj T*", b"(Asm: 0) Tj")
+    assert _peek_content_fields(data) is None
+
+
+def test_peek_rejects_text_moved_along_the_same_line():
+    # pypdf reads "Part: P1MORE" here.
+    data = _stream(b"(Job: 1) Tj T*", b"(Part: P1) Tj 40 0 Td (MORE) Tj T*", b"(Asm: 0) Tj")
+    assert _peek_content_fields(data) is None
+
+
+def test_peek_rejects_small_vertical_step():
+    # A 2pt drop is not a new line for pypdf, so this is "Part: KL".
+    data = _stream(b"(Job: 1) Tj T*", b"(Part: K) Tj 0 -2 Td (L) Tj T*", b"(Asm: 0) Tj")
+    assert _peek_content_fields(data) is None
+
+
+def test_peek_needs_the_end_of_the_last_line():
+    data = _stream(b"(Job: 1) Tj T*", b"(Part: Q) Tj T*", b"(Asm: 2) Tj")
+    assert _peek_content_fields(data) == ("Q", "2", "1")
+    assert _peek_content_fields(data, complete=False) is None
+
+
+def test_peek_rejects_label_split_across_operands():
+    # pypdf reads "Part: 9" from the first line and never sees "A".
+    for split in (b"(Par) Tj (t: 9) Tj T*", b"[(Par) -10 (t: 9)] TJ T*", b"<506172743a2039> Tj T*"):
+        data = _stream(b"(Job: 1) Tj T*", split, b"(Part: A) Tj T*", b"(Asm: 0) Tj")
+        assert _peek_content_fields(data) is None
+
+
+def test_peek_rejects_non_ascii_values():
+    # 0x96 is an en dash under WinAnsiEncoding, not latin-1.
+    data = _stream(b"(Job: 1) Tj T*", b"(Part: 12\x96A) Tj T*", b"(Asm: 0) Tj")
+    assert _peek_content_fields(data) is None
+
+
+_HELVETICA = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+
+
+def _pdf(stream: bytes, font: bytes = _HELVETICA, form: bytes | None = None) -> bytes:
+    resources = b"/Font << /F1 3 0 R >>"
+    if form is not None:
+        resources += b" /XObject << /Fm1 6 0 R >>"
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [4 0 R] /Count 1 >>",
+        font,
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792]"
+        b" /Resources << %s >> /Contents 5 0 R >>" % resources,
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+    ]
+    if form is not None:
+        objects.append(
+            b"<< /Type /XObject /Subtype /Form /BBox [0 0 612 792]"
+            b" /Resources << /Font << /F1 3 0 R >> >> /Length %d >>\nstream\n%s\nendstream"
+            % (len(form), form)
+        )
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(out)
+
+
+def _first_page(pdf: bytes):
+    pypdf = pytest.importorskip("pypdf")
+    return pypdf.PdfReader(io.BytesIO(pdf)).pages[0]
+
+
+def test_peek_fields_checks_font_encoding():
+    data = _stream(b"(Job: 1) Tj T*", b"(Part: Q) Tj T*", b"(Asm: 2) Tj")
+    winansi = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+    remapped = (
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica"
+        b" /Encoding << /Type /Encoding /Differences [81 /A] >> >>"
+    )
+    assert _peek_fields(_first_page(_pdf(data, winansi))) == ("Q", "2", "1")
+    assert _peek_fields(_first_page(_pdf(data, remapped))) is None
+
+
+def test_header_text_stops_early_with_the_same_fields():
+    page = _first_page(_pdf(_stream(b"(Job: 1) Tj T*", b"(Part: Q) Tj T*", b"(Asm: 2) Tj T*", b"(rest) Tj")))
+    text = _extract_header_text(page)
+    assert "rest" not in text
+    assert extract_fields(text) == ("Q", "2", "1")
+
+
+def test_header_text_does_not_stop_early_across_form_xobjects():
+    # pypdf reports form text to the visitor twice, so the chunks seen so far
+    # are not a prefix of the real text.
+    stream = b"BT /F1 12 Tf 72 720 Td (Job: 1) Tj ET /Fm1 Do BT /F1 12 Tf 72 600 Td (2) Tj ET"
+    form = b"BT /F1 12 Tf 72 700 Td (Part: A) Tj 0 -14 Td (Asm:) Tj ET"
+    page = _first_page(_pdf(stream, form=form))
+    assert extract_fields(_extract_header_text(page)) == extract_fields(page.extract_text())